@@ -0,0 +1,102 @@
+import os
+import re
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+
+_ZEROCOPY = "http.response.zerocopysend"
+_SINGLE_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class _RangeNotSatisfiable(Exception):
+    pass
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into a half-open (start, end) span.
+    Returns None for anything else (multi-range, malformed) so the caller can defer.
+    """
+    m = _SINGLE_RANGE.match(header)
+    if not m or not any(m.groups()):
+        return None
+    first, last = m.groups()
+    if not first:  # suffix range: last N bytes
+        if int(last) == 0 or size == 0:
+            raise _RangeNotSatisfiable
+        return max(0, size - int(last)), size
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise _RangeNotSatisfiable
+    return start, min(int(last) + 1, size) if last else size
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse that hands the open file descriptor to the server when it supports the
+    ASGI zero-copy send extension, so the body goes kernel → socket (sendfile) without
+    passing through Python. On that path single `Range: bytes=` requests are answered with
+    206 and only the requested slice. Without the extension, and for anything else,
+    the regular FileResponse (including its own Range handling) serves the request.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+
+        req_headers = Headers(scope=scope)
+        http_range = req_headers.get("range")
+        if self.status_code != 200 or "if-range" in req_headers:
+            http_range = None
+        if _ZEROCOPY not in scope.get("extensions", {}):
+            await super().__call__(scope, receive, send)
+            return
+
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            self.set_stat_headers(self.stat_result)
+        size = self.stat_result.st_size
+
+        status, raw_headers = self.status_code, self.raw_headers
+        start, end = 0, size
+        if http_range:
+            try:
+                span = _parse_range(http_range, size)
+            except _RangeNotSatisfiable:
+                response = PlainTextResponse(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+                await response(scope, receive, send)
+                return
+            if span is None:
+                await super().__call__(scope, receive, send)
+                return
+            start, end = span
+            headers = MutableHeaders(raw=list(self.raw_headers))
+            headers["content-range"] = f"bytes {start}-{end - 1}/{size}"
+            headers["content-length"] = str(end - start)
+            status, raw_headers = 206, headers.raw
+
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        if scope["method"].upper() == "HEAD" or start >= end:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": _ZEROCOPY,
+                    "file": f.fileno(),
+                    "offset": start,
+                    "count": end - start,
+                    "more_body": False,
+                })
+
+        if self.background is not None:
+            await self.background()
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from anyio.to_thread import run_sync
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 
-from app.config.config import get_settings
+from app.api.responses import ZeroCopyFileResponse
 from app.domain.schemas import (
     JobCreate,
     JobCreateResponse,
@@ -9,35 +10,22 @@ from app.domain.schemas import (
     Manifest,
 )
 from app.domain.states import JobState
-from app.services.jobs.manager import JobManager  
+from app.services.jobs.manager import JobManager, get_job_manager
+from app.services.jobs.worker import submit_job
 
 
 router = APIRouter()
 
 
-def get_manager() -> JobManager:
-    """Build a JobManager using current Settings."""
-    s = get_settings()
-    return JobManager(
-        data_dir=s.data_dir,
-        jobs_dir=s.jobs_path,
-        cache_dir=s.cache_path,
-        google_api_key=s.google_api_key,
-        do_chunk=s.do_chunk,
-        tts_model=s.tts_model,
-        whisper_model=s.whisper_model,
-        whisper_device=s.whisper_device,
-        whisper_compute_type=s.whisper_compute_type,
-        request_timeout_sec=s.request_timeout_sec,
-        max_text_chars=s.max_text_chars,
-        de_dialect=s.de_dialect,
-    )
+async def get_manager() -> JobManager:
+    """Shared JobManager built from current Settings (read paths are stateless)."""
+    # async so FastAPI resolves it on the event loop instead of a threadpool hop
+    return get_job_manager()
 
 
 @router.post("/jobs", response_model=JobCreateResponse)
-def create_job(
+async def create_job(
     body: JobCreate,
-    background: BackgroundTasks,
     manager: JobManager = Depends(get_manager),
 ) -> JobCreateResponse:
     """
@@ -56,48 +44,64 @@ def create_job(
     if not body.roles:
         raise HTTPException(status_code=400, detail="Must include at least one role")
 
-    job_id = manager.create_job(body)
-    background.add_task(manager.run_job, job_id)  # Background task
+    job_id = await run_sync(manager.create_job, body)
+    submit_job(job_id)  # Runs on the job worker pool
     return JobCreateResponse(jobId=job_id)
 
 
 @router.get("/jobs/{job_id}", response_model=JobStatus)
-def get_job_status(job_id: str, manager: JobManager = Depends(get_manager)) -> JobStatus:
-    status = manager.get_status(job_id)
+async def get_job_status(job_id: str, manager: JobManager = Depends(get_manager)) -> Response:
+    status = await run_sync(manager.get_status, job_id)
     if status is None:
         raise HTTPException(status_code=404, detail="Job not found.")
-    return status
+    # Returning a Response skips FastAPI's response_model validation + re-serialization
+    return Response(status.model_dump_json(), media_type="application/json")
 
 
 @router.get("/jobs/{job_id}/manifest", response_model=Manifest)
-def get_manifest(job_id: str, manager: JobManager = Depends(get_manager)) -> Manifest:
-    if not manager.exists(job_id):
+async def get_manifest(job_id: str, manager: JobManager = Depends(get_manager)) -> Manifest:
+    if not await run_sync(manager.exists, job_id):
         raise HTTPException(status_code=404, detail="Job not found.")
     try:
-        return manager.get_manifest(job_id)
+        return await run_sync(manager.get_manifest, job_id)
     except FileNotFoundError:
-        st = manager.get_status(job_id)
+        st = await run_sync(manager.get_status, job_id)
         if st and st.state == JobState.FAILED:
             raise HTTPException(status_code=400, detail=st.error or "Job failed.")
         raise HTTPException(status_code=409, detail="Job not ready.")
 
 
 @router.get("/jobs/{job_id}/audio")
-def get_audio(job_id: str, manager: JobManager = Depends(get_manager)) -> FileResponse:
-    if not manager.exists(job_id):
+async def get_audio(job_id: str, manager: JobManager = Depends(get_manager)) -> ZeroCopyFileResponse:
+    if not await run_sync(manager.exists, job_id):
         raise HTTPException(status_code=404, detail="Job not found.")
-    path = manager.get_audio_path(job_id)
-    if not path.exists():
+    path = await run_sync(manager.get_audio_path, job_id)  # may read origin.txt
+    if not await run_sync(path.exists):
         raise HTTPException(status_code=409, detail="Audio not ready.")
     media_type = "audio/wav" if path.suffix.lower() == ".wav" else "audio/mpeg"
-    return FileResponse(path, media_type=media_type, filename=path.name)
+    return ZeroCopyFileResponse(path, media_type=media_type, filename=path.name)
 
 
 @router.get("/jobs/{job_id}/timings")
-def get_timings(job_id: str, manager: JobManager = Depends(get_manager)) -> JSONResponse:
-    if not manager.exists(job_id):
+async def get_timings(job_id: str, manager: JobManager = Depends(get_manager)) -> ZeroCopyFileResponse:
+    if not await run_sync(manager.exists, job_id):
         raise HTTPException(status_code=404, detail="Job not found.")
-    path = manager.get_timings_path(job_id)
-    if not path.exists():
+    path = await run_sync(manager.get_timings_path, job_id)
+    if not await run_sync(path.exists):
         raise HTTPException(status_code=409, detail="Timings not ready.")
-    return JSONResponse(manager.read_timings(job_id))
+    # Already valid JSON on disk: stream it as-is instead of parse + re-serialize
+    return ZeroCopyFileResponse(path, media_type="application/json")
+
+
+@router.get("/jobs/{job_id}/timings.msgpack")
+async def get_timings_msgpack(job_id: str, manager: JobManager = Depends(get_manager)) -> Response:
+    if not await run_sync(manager.exists, job_id):
+        raise HTTPException(status_code=404, detail="Job not found.")
+    path = await run_sync(manager.get_timings_msgpack_path, job_id)
+    if await run_sync(path.exists):
+        return ZeroCopyFileResponse(path, media_type="application/msgpack")
+    # Older jobs only have timings.json
+    json_path = await run_sync(manager.get_timings_path, job_id)
+    if not await run_sync(json_path.exists):
+        raise HTTPException(status_code=409, detail="Timings not ready.")
+    return Response(await run_sync(manager.read_timings_msgpack, job_id), media_type="application/msgpack")
@@ -15,6 +15,7 @@ class Settings(BaseModel):
     host: str = os.getenv("HOST", "0.0.0.0")
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    workers: int = int(os.getenv("WORKERS", "1"))  # uvicorn processes; each owns a job worker pool
 
     # --- TLS / SSL (optional) ---
     ssl_keyfile: Optional[str] = os.getenv("SSL_KEYFILE") or None
@@ -32,19 +33,31 @@ class Settings(BaseModel):
     data_dir: Path = Path(os.getenv("DATA_DIR", "./data")).resolve()
     jobs_dirname: str = os.getenv("JOBS_DIRNAME", "jobs")
     cache_dirname: str = os.getenv("CACHE_DIRNAME", "cache")
+    # Cache hits copy/link artifacts into the new job dir instead of pointing at the origin job
+    cache_materialize: bool = os.getenv("CACHE_MATERIALIZE", "false").lower() == "true"
 
     # --- Alignment ---
     whisper_model: str = os.getenv("WHISPER_MODEL", "tiny.en")
     whisper_device: str = os.getenv("WHISPER_DEVICE", "auto")  # "cpu", "cuda", or "auto"
     whisper_compute_type: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # "int8" or "float16"
+    # On CUDA, "int8" is upgraded to this mixed type (int8 weights, fp16 activations); on CPU "int8"
+    # already dispatches to CTranslate2's VNNI/AVX2 int8 kernels.
+    whisper_compute_type_cuda: str = os.getenv("WHISPER_COMPUTE_TYPE_CUDA", "int8_float16")
+    whisper_preload: bool = os.getenv("WHISPER_PRELOAD", "true").lower() == "true"  # load model at startup
 
     # --- Limits & Timeouts ---
     max_text_chars: int = int(os.getenv("MAX_TEXT_CHARS", "120000"))  # ~20k words
     request_timeout_sec: int = int(os.getenv("REQUEST_TIMEOUT_SEC", "900"))  
     do_chunk: bool = os.getenv("DO_CHUNK", "false").lower() == "true"
+    tts_requests_per_batch: int = int(os.getenv("TTS_REQUESTS_PER_BATCH", "1"))  # chunks per TTS request
+
+    # --- Job workers ---
+    # Processes running jobs; each loads its own Whisper model (and CUDA context), so keep it small
+    job_workers: int = int(os.getenv("JOB_WORKERS", "2"))
 
     # --- Normalization ---
     de_dialect: bool = os.getenv("DE_DIALECT", "false").lower() == "true"
+    dialect_workers: int = int(os.getenv("DIALECT_WORKERS", "0"))  # per job process; 0 = its share of cores
 
     @property
     def jobs_path(self) -> Path:
@@ -54,6 +67,13 @@ class Settings(BaseModel):
     def cache_path(self) -> Path:
         return self.data_dir / self.cache_dirname
     
+    @property
+    def dialect_pool_size(self) -> int:
+        """Dialect processes per job worker; by default the cores are split across all job workers."""
+        if self.dialect_workers > 0:
+            return self.dialect_workers
+        return max(1, (os.cpu_count() or 1) // max(1, self.workers * self.job_workers))
+
     @property
     def instructions_path(self) -> Path:
         return Path(__file__).resolve().parents[1] / "config" / self.instructions_filename
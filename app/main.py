@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -7,15 +8,26 @@ from starlette.staticfiles import StaticFiles
 from app.config.config import get_settings
 from app.utils.logging import configure_logging  
 from app.api.routes_jobs import router as jobs_router
+from app.services.jobs.worker import shutdown_workers
+from app.utils.cache import clear_stale_inflight
 
 
 settings = get_settings()
 configure_logging(settings.debug)
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    clear_stale_inflight(settings.cache_path)  # claims left by jobs that died with a previous run
+    yield
+    shutdown_workers()
+
+
 app = FastAPI(
     title="Voice Loom",
     version="0.1.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # CORS
@@ -1,10 +1,26 @@
 import re
+import os
+import sys
+import json
 import difflib
+import hashlib
+import tempfile
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 
-from faster_whisper import WhisperModel
+import ctranslate2
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+from app.utils.files import set_default_mode
+
+try:
+    from rapidfuzz.distance import Levenshtein
+except ImportError:  # pure-Python difflib fallback
+    Levenshtein = None
 
 
 def align_audio(
@@ -14,9 +30,12 @@ def align_audio(
     model_name: str,
     device: str,         
     compute_type: str,   
+    cuda_compute_type: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
 ) -> Dict[str, Any]:
     """
     Return {"words": [{"w": str, "s": float, "e": float, "idx": int}, ...]}.
+    If cache_dir is given, ASR output is cached there by audio content + model settings.
     """
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio not found: {audio_path}")
@@ -25,12 +44,23 @@ def align_audio(
     if not ref_tokens:
         return {"words": []}
 
-    asr_words = _transcribe_words( 
-        audio_path=audio_path,
-        model_name=model_name,
-        device=device,
-        compute_type=compute_type,
-    )  
+    asr_cache: Optional[Path] = None
+    asr: Optional[Tuple[List[ASRWord], List[str]]] = None
+    if cache_dir is not None:
+        asr_cache = _asr_cache_path(cache_dir, audio_path, model_name, device, compute_type, cuda_compute_type)
+        asr = _load_asr_cache(asr_cache)
+
+    if asr is None:
+        asr = _transcribe_words( 
+            audio_path=audio_path,
+            model_name=model_name,
+            device=device,
+            compute_type=compute_type,
+            cuda_compute_type=cuda_compute_type,
+        )  
+        if asr_cache is not None:
+            _save_asr_cache(asr_cache, asr[0])
+    asr_words, hyp_tokens = asr
 
     # No ASR tokens: return monotonically increasing tiny spans
     if not asr_words:
@@ -42,14 +72,18 @@ def align_audio(
             t += dt
         return {"words": out}
 
-    hyp_tokens = [w.word_norm for w in asr_words]
-
-    sm = difflib.SequenceMatcher(a=hyp_tokens, b=ref_tokens, autojunk=False)
-    ops = sm.get_opcodes()
-    aligned = _assign_timings(ref_tokens, asr_words, ops)
+    if hyp_tokens == ref_tokens:
+        # ASR read the script back verbatim (interned tokens make this an identity scan)
+        ops = [("equal", 0, len(ref_tokens), 0, len(ref_tokens))]
+    else:
+        ops = _opcodes(hyp_tokens, ref_tokens)
+    starts, ends = _assign_timings(ref_tokens, asr_words, ops)
 
     return {
-        "words": [{"w": w.text, "s": w.start, "e": w.end, "idx": i} for i, w in enumerate(aligned)]
+        "words": [
+            {"w": w, "s": s, "e": e, "idx": i}
+            for i, (w, s, e) in enumerate(zip(ref_tokens, starts.tolist(), ends.tolist()))
+        ]
     }
 
 
@@ -62,26 +96,56 @@ class ASRWord:
     start: float
     end: float
 
-@dataclass
-class RefWordTimed:
-    text: str
-    start: float = 0.0
-    end: float = 0.0
+
+_MODEL_LOCK = threading.Lock()
+_BATCH_SIZE = 8  # VAD chunks decoded per encoder/decoder call
+
+
+@lru_cache(maxsize=4)
+def _load_whisper_model(model_name: str, device: str, compute_type: str) -> WhisperModel:
+    return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+
+def _route_compute_type(device: str, compute_type: str, cuda_compute_type: Optional[str]) -> str:
+    """Swap plain int8 for the CUDA override when the model will run on a GPU."""
+    if not cuda_compute_type or compute_type != "int8":
+        return compute_type
+    on_cuda = device == "cuda" or (device == "auto" and ctranslate2.get_cuda_device_count() > 0)
+    return cuda_compute_type if on_cuda else compute_type
+
+
+def get_whisper_model(
+    model_name: str, device: str, compute_type: str, cuda_compute_type: Optional[str] = None
+) -> WhisperModel:
+    """Process-wide WhisperModel, loaded once per (model, device, compute_type)."""
+    compute_type = _route_compute_type(device, compute_type, cuda_compute_type)
+    with _MODEL_LOCK:  # lru_cache alone would let two concurrent first calls both load
+        return _load_whisper_model(model_name, device, compute_type)
 
 
 def _transcribe_words(
-    *, audio_path: Path, model_name: str, device: str, compute_type: str
-) -> List[ASRWord]:
-    model = WhisperModel(model_name, device=device, compute_type=compute_type)
-    segments, _ = model.transcribe(
+    *,
+    audio_path: Path,
+    model_name: str,
+    device: str,
+    compute_type: str,
+    cuda_compute_type: Optional[str] = None,
+) -> Tuple[List[ASRWord], List[str]]:
+    """Return (words, hyp_tokens); the tokens are collected in the same pass."""
+    model = get_whisper_model(model_name, device, compute_type, cuda_compute_type)
+    pipeline = BatchedInferencePipeline(model=model)
+    segments, _ = pipeline.transcribe(
         str(audio_path),
+        batch_size=_BATCH_SIZE,
         vad_filter=True,
         word_timestamps=True,
         beam_size=1,
         language="en",  
     )
 
-    out: List[ASRWord] = []
+    toks: List[str] = []
+    raw_starts: List[float] = []
+    raw_ends: List[float] = []
     for seg in segments:
         if not getattr(seg, "words", None):
             continue
@@ -91,26 +155,109 @@ def _transcribe_words(
             tok = _normalize_word(w.word or "")
             if not tok:
                 continue
-            out.append(ASRWord(word_norm=tok, start=float(w.start), end=float(w.end)))
+            toks.append(tok)
+            raw_starts.append(float(w.start))
+            raw_ends.append(float(w.end))
+
+    starts = np.asarray(raw_starts, dtype=np.float64)
+    ends = np.asarray(raw_ends, dtype=np.float64)
+    _fix_monotonic(starts, ends)
+    words = [ASRWord(word_norm=t, start=s, end=e) for t, s, e in zip(toks, starts.tolist(), ends.tolist())]
+    return words, toks
+
+
+# --- ASR cache ---
 
-    _fix_monotonic(out)
-    return out
+_HASH_BLOCK = 1 << 20
+_ASR_CACHE_MAX = 512  # transcripts kept; least recently used go first
+
+
+def _asr_cache_path(
+    cache_dir: Path,
+    audio_path: Path,
+    model_name: str,
+    device: str,
+    compute_type: str,
+    cuda_compute_type: Optional[str],
+) -> Path:
+    h = hashlib.blake2b(digest_size=16)
+    with audio_path.open("rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+    h.update(f"\0{model_name}\0{device}\0{compute_type}\0{cuda_compute_type or ''}".encode("utf-8"))
+    return cache_dir / "asr" / f"{h.hexdigest()}.json"
+
+
+def _load_asr_cache(path: Path) -> Optional[Tuple[List[ASRWord], List[str]]]:
+    try:
+        rows = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)  # mtime doubles as last-use time for pruning
+    except OSError:
+        pass
+    words: List[ASRWord] = []
+    hyp: List[str] = []
+    for w, s, e in rows:
+        tok = sys.intern(w)
+        words.append(ASRWord(word_norm=tok, start=s, end=e))
+        hyp.append(tok)
+    return words, hyp
+
+
+def _save_asr_cache(path: Path, words: List[ASRWord]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = [[w.word_norm, w.start, w.end] for w in words]
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    set_default_mode(fd)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    _prune_asr_cache(path.parent)
+
+
+def _prune_asr_cache(d: Path) -> None:
+    """Keep at most _ASR_CACHE_MAX transcripts, dropping the least recently used."""
+    aged = []
+    for p in d.glob("*.json"):
+        try:
+            aged.append((p.stat().st_mtime, p))
+        except FileNotFoundError:
+            continue
+    if len(aged) <= _ASR_CACHE_MAX:
+        return
+    aged.sort()
+    for _, p in aged[:len(aged) - _ASR_CACHE_MAX]:
+        p.unlink(missing_ok=True)
+
+
+def _opcodes(hyp_tokens: List[str], ref_tokens: List[str]) -> List[Tuple[str, int, int, int, int]]:
+    """Edit ops turning hyp into ref, as difflib-style (tag, i1, i2, j1, j2) tuples."""
+    if Levenshtein is not None:
+        return [tuple(op) for op in Levenshtein.opcodes(hyp_tokens, ref_tokens)]
+    sm = difflib.SequenceMatcher(a=hyp_tokens, b=ref_tokens, autojunk=False)
+    return sm.get_opcodes()
 
 
 def _assign_timings(
     ref_tokens: List[str],
     asr_words: List[ASRWord],
     ops: List[Tuple[str, int, int, int, int]],
-) -> List[RefWordTimed]:
-    out: List[RefWordTimed] = [RefWordTimed(text=t) for t in ref_tokens]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return parallel (starts, ends) arrays, one entry per reference token."""
+    starts = np.zeros(len(ref_tokens), dtype=np.float64)
+    ends = np.zeros(len(ref_tokens), dtype=np.float64)
     N = len(asr_words)
+    asr_starts = np.fromiter((w.start for w in asr_words), dtype=np.float64, count=N)
+    asr_ends = np.fromiter((w.end for w in asr_words), dtype=np.float64, count=N)
 
     def asr_window(i1: int, i2: int) -> Tuple[float, float]:
         if i2 > i1:
-            return asr_words[i1].start, asr_words[i2 - 1].end
+            return float(asr_starts[i1]), float(asr_ends[i2 - 1])
         # interpolate between neighbors
-        left = asr_words[i1 - 1].end if i1 - 1 >= 0 else None
-        right = asr_words[i1].start if i1 < N else None
+        left = float(asr_ends[i1 - 1]) if i1 - 1 >= 0 else None
+        right = float(asr_starts[i1]) if i1 < N else None
         if left is not None and right is not None and right > left:
             return left, right
         if left is not None:
@@ -120,38 +267,29 @@ def _assign_timings(
         return 0.0, 0.02
 
     def assign_linear(j1: int, j2: int, t0: float, t1: float):
-        count = max(1, j2 - j1)
-        span = max(0.0, t1 - t0)
-        if span <= 0:
-            dt = 0.01
-            cur = t0
-            for j in range(j1, j2):
-                out[j].start = cur
-                out[j].end = cur + dt
-                cur += dt
+        count = j2 - j1
+        if count <= 0:
+            return
+        if t1 - t0 <= 0:
+            cur = t0 + 0.01 * np.arange(count + 1)
+            starts[j1:j2] = cur[:-1]
+            ends[j1:j2] = cur[1:]
             return
-        step = span / count
-        cur = t0
-        for j in range(j1, j2):
-            s = cur
-            e = t1 if j == j2 - 1 else (s + step)
-            out[j].start = s
-            out[j].end = max(e, s + 1e-3)
-            cur = e
+        cur = np.linspace(t0, t1, count + 1)
+        starts[j1:j2] = cur[:-1]
+        ends[j1:j2] = np.maximum(cur[1:], cur[:-1] + 1e-3)
 
     for tag, i1, i2, j1, j2 in ops:
         if tag == "equal":
-            k = i1
-            for j in range(j1, j2):
-                if k < N:
-                    out[j].start = asr_words[k].start
-                    out[j].end = asr_words[k].end
-                else:
-                    # no ASR left, place tiny span after last assigned
-                    last = out[j - 1].end if j > j1 else (asr_words[-1].end if N else 0.0)
-                    out[j].start = last
-                    out[j].end = last + 0.01
-                k += 1
+            n = min(j2 - j1, max(0, N - i1))
+            starts[j1:j1 + n] = asr_starts[i1:i1 + n]
+            ends[j1:j1 + n] = asr_ends[i1:i1 + n]
+            if n < j2 - j1:
+                # no ASR left (malformed ops), place tiny spans after last assigned
+                last = ends[j1 + n - 1] if n else (asr_ends[-1] if N else 0.0)
+                cur = last + 0.01 * np.arange(j2 - j1 - n + 1)
+                starts[j1 + n:j2] = cur[:-1]
+                ends[j1 + n:j2] = cur[1:]
         elif tag in ("replace", "insert"):
             t0, t1 = asr_window(i1, i2)
             assign_linear(j1, j2, t0, t1)
@@ -159,49 +297,40 @@ def _assign_timings(
             # ASR had extra tokens; nothing to do for reference
             continue
 
-    _fix_ref_monotonic(out)
-    return out
+    _fix_monotonic(starts, ends)
+    return starts, ends
 
 
 # --- normalization utils ---
 
-_WS = re.compile(r"\s+")
 _PAREN = re.compile(r"\([^)]*\)")
 _PUNCT = re.compile(r"[^\w']+")
+_TRANS = str.maketrans({"…": "...", "’": "'", "‘": "'"})
 
 def _normalize_and_tokenize(text: str) -> List[str]:
-    text = _PAREN.sub(" ", text)
-    text = text.replace("…", "...").replace("’", "'").replace("‘", "'").lower()
-    text = _WS.sub(" ", text).strip()
-    toks_raw = text.split()
-    toks: List[str] = []
-    for t in toks_raw:
-        cleaned = _PUNCT.sub(" ", t).strip()
-        if cleaned:
-            toks.extend([x for x in cleaned.split() if x])
-    return toks
+    text = _PAREN.sub(" ", text).translate(_TRANS).lower()
+    return [sys.intern(t) for t in _PUNCT.split(text) if t]
 
 def _normalize_word(word: str) -> str:
-    w = word.strip().replace("…", "...").replace("’", "'").replace("‘", "'").lower()
+    w = word.strip().translate(_TRANS).lower()
     w = _PUNCT.sub("", w)
-    return w
+    return sys.intern(w)
 
-def _fix_monotonic(words: List[ASRWord]) -> None:
-    eps = 1e-3
-    last = 0.0
-    for w in words:
-        if w.start < last - eps:
-            w.start = last
-        if w.end < w.start + eps:
-            w.end = w.start + eps
-        last = w.end
-
-def _fix_ref_monotonic(refs: List[RefWordTimed]) -> None:
+def _fix_monotonic(starts: np.ndarray, ends: np.ndarray) -> None:
+    """
+    In place: end >= start + eps, and no span starts more than eps before the previous end
+    (clamped to it instead). Vectorized via a running max of ends.
+
+    Unlike a sequential pass, a run of consecutive clamped spans all start at the same
+    running max rather than each being pushed eps past its predecessor, so they overlap;
+    the k-th span of such a run lands up to k * eps earlier than the loop would put it.
+    """
+    if not len(starts):
+        return
     eps = 1e-3
-    last = 0.0
-    for r in refs:
-        if r.start < last - eps:
-            r.start = last
-        if r.end < r.start + eps:
-            r.end = r.start + eps
-        last = r.end
+    np.maximum(ends, starts + eps, out=ends)
+    prev_end = np.empty_like(ends)
+    prev_end[0] = 0.0
+    np.maximum.accumulate(np.maximum(ends[:-1], 0.0), out=prev_end[1:])
+    np.copyto(starts, prev_end, where=starts < prev_end - eps)
+    np.maximum(ends, starts + eps, out=ends)
@@ -1,31 +1,120 @@
 import json
 import os
+import sys
 import shutil
+import tempfile
 import time
 import uuid
 import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Hashable, Optional, List, Tuple
 
+import msgpack
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app.config.config import Settings, get_settings
 from app.utils.instructions import prepend_tts_instructions
 from app.domain.schemas import JobCreate, JobStatus, Manifest, SpeakerRegistry
-from app.domain.states import JobState, can_transition
+from app.domain.states import JobState, can_transition, is_terminal
 from app.utils.roles import resolve_registry
 from app.services.synth.singlepass import synthesize_single_pass  
 from app.services.synth.chunking import synthesize_chunked
-from app.utils.cache import make_cache_key, lookup_origin_job, record_origin_job
+from app.utils.cache import (
+    make_cache_key,
+    lookup_origin_job,
+    record_origin_job,
+    claim_inflight,
+    release_inflight,
+    touch_inflight,
+    inflight_age,
+    INFLIGHT_STALE_SEC,
+)
 from app.services.align.aligner import align_audio
+from app.utils.files import set_default_mode
 from app.utils.logging import get_logger
 from app.services.process.mastering import (
     parse_text,
     build_ui_script,
     build_alignment_text_from_ui,
 )
-from app.services.process.normalization import apply_de_dialect
+from app.services.process.normalization import PARALLEL_MIN_CHARS, apply_de_dialect_to_doc
 
 logger = get_logger(__name__)
 
+_INFLIGHT_POLL_SEC = 1.0
+_INFLIGHT_HEARTBEAT_SEC = 5.0  # owner refreshes its claim's mtime this often
+_TERMINAL_STATES_MAX = 10_000
+_ORIGIN_FILE = "origin.txt"  # cache-hit jobs: id of the job whose artifacts they share
+_FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+@lru_cache(maxsize=1)
+def _clonefile():
+    import ctypes
+
+    fn = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno=True).clonefile
+    fn.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    fn.restype = ctypes.c_int
+    return fn
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """
+    Copy-on-write clone of src at dst (FICLONE on Linux btrfs/xfs, clonefile on APFS).
+    Returns False, leaving nothing at dst, when the platform or filesystem can't do it.
+    """
+    if sys.platform == "darwin":
+        try:
+            return _clonefile()(os.fsencode(src), os.fsencode(dst), 0) == 0
+        except (OSError, AttributeError):
+            return False
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        with src.open("rb") as fs, dst.open("xb") as fd:
+            try:
+                fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+            except OSError:
+                fd.close()
+                dst.unlink(missing_ok=True)
+                return False
+    except OSError:
+        return False
+    return True
+
+
+def _sendfile_copy(src: Path, dst: Path) -> None:
+    """shutil.copy2 equivalent that keeps the bytes in the kernel via sendfile(2) where it can."""
+    if not sys.platform.startswith("linux"):  # sendfile elsewhere needs a socket destination
+        shutil.copy2(src, dst)
+        return
+    with src.open("rb") as fs, dst.open("wb") as fd:
+        src_fd, dst_fd = fs.fileno(), fd.fileno()
+        size = os.fstat(src_fd).st_size
+        os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:  # source shrank underneath us
+                break
+            offset += sent
+    shutil.copystat(src, dst)
+
 
 @dataclass
 class ManagerConfig:
@@ -38,9 +127,59 @@ class ManagerConfig:
     whisper_model: str
     whisper_device: str
     whisper_compute_type: str
+    whisper_compute_type_cuda: Optional[str]
     request_timeout_sec: int
     max_text_chars: int
     de_dialect: bool
+    cache_materialize: bool = False
+    requests_per_batch: int = 1
+    dialect_workers: int = 1
+
+
+class _LRU:
+    """Small thread-safe LRU map on top of OrderedDict."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+_scripts_cache = _LRU(32)  # (script, de_dialect) -> (ui_script, alignment_script)
+
+
+def _compute_scripts(
+    script: str, de_dialect: bool, executor: Optional[ProcessPoolExecutor] = None
+) -> Tuple[str, str]:
+    """
+    (ui_script, alignment_script) for a raw script; deterministic, so resubmissions skip the work.
+    executor only speeds up the dialect pass, so it is not part of the cache key.
+    """
+    key = (script, de_dialect)
+    cached = _scripts_cache.get(key)
+    if cached is not None:
+        return cached
+    doc = parse_text(script)
+    if de_dialect:
+        doc = apply_de_dialect_to_doc(doc, executor=executor)
+    ui_script = build_ui_script(doc)
+    result = (ui_script, build_alignment_text_from_ui(ui_script))
+    _scripts_cache.put(key, result)
+    return result
 
 
 class JobManager:
@@ -63,6 +202,10 @@ class JobManager:
         request_timeout_sec: int,
         max_text_chars: int,
         de_dialect: bool = False,
+        whisper_compute_type_cuda: Optional[str] = None,
+        cache_materialize: bool = False,
+        requests_per_batch: int = 1,
+        dialect_workers: int = 1,
     ):
         self.cfg = ManagerConfig(
             data_dir=data_dir,
@@ -74,14 +217,45 @@ class JobManager:
             whisper_model=whisper_model,
             whisper_device=whisper_device,
             whisper_compute_type=whisper_compute_type,
+            whisper_compute_type_cuda=whisper_compute_type_cuda,
             request_timeout_sec=request_timeout_sec,
             max_text_chars=max_text_chars,
             de_dialect=de_dialect,
+            cache_materialize=cache_materialize,
+            requests_per_batch=requests_per_batch,
+            dialect_workers=dialect_workers,
         )
         
         self.cfg.jobs_dir.mkdir(parents=True, exist_ok=True)
         self.cfg.cache_dir.mkdir(parents=True, exist_ok=True)
         self._app_root = Path(__file__).resolve().parents[2]
+        # READY/FAILED never change, so they can be remembered without invalidation
+        self._terminal_states = _LRU(_TERMINAL_STATES_MAX)
+        # Created on the first large de-dialect script
+        self._dialect_pool: Optional[ProcessPoolExecutor] = None
+        self._dialect_pool_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, s: Settings) -> "JobManager":
+        """Build a JobManager from application Settings."""
+        return cls(
+            data_dir=s.data_dir,
+            jobs_dir=s.jobs_path,
+            cache_dir=s.cache_path,
+            google_api_key=s.google_api_key,
+            do_chunk=s.do_chunk,
+            tts_model=s.tts_model,
+            whisper_model=s.whisper_model,
+            whisper_device=s.whisper_device,
+            whisper_compute_type=s.whisper_compute_type,
+            request_timeout_sec=s.request_timeout_sec,
+            max_text_chars=s.max_text_chars,
+            de_dialect=s.de_dialect,
+            whisper_compute_type_cuda=s.whisper_compute_type_cuda,
+            cache_materialize=s.cache_materialize,
+            requests_per_batch=s.tts_requests_per_batch,
+            dialect_workers=s.dialect_pool_size,
+        )
 
     # --- Used by routes ---
 
@@ -112,6 +286,9 @@ class JobManager:
         return job_id
 
     def run_job(self, job_id: str) -> None:
+        inflight_key: Optional[str] = None
+        heartbeat: Optional[threading.Event] = None
+        jd = self._job_dir(job_id)
         try:
             self._transition(job_id, JobState.SYNTHESIZING) 
 
@@ -120,19 +297,12 @@ class JobManager:
             roles: List[str] = body.get("roles") or []
             
             # Resolve registry from YAML file
-            registry: SpeakerRegistry = resolve_registry(
-                roles,
-                search_paths=[
-                    self._app_root / "config" / "voices.yml",
-                    self._app_root / "config" / "voices.yaml",
-                ],
-            )
+            registry: SpeakerRegistry = self._resolve_registry(roles)
 
-            doc = parse_text(script)
-            ui_script = build_ui_script(doc)
-            if self.cfg.de_dialect:
-                ui_script = apply_de_dialect(ui_script)
-            alignment_script = build_alignment_text_from_ui(ui_script)
+            pool = None
+            if self.cfg.de_dialect and self.cfg.dialect_workers > 1 and len(script) > PARALLEL_MIN_CHARS:
+                pool = self._get_dialect_pool()
+            ui_script, alignment_script = _compute_scripts(script, self.cfg.de_dialect, pool)
 
             effective_script = prepend_tts_instructions(script)
 
@@ -140,20 +310,34 @@ class JobManager:
 
             cache_key = make_cache_key(alignment_script, registry, self.cfg.tts_model)
             origin_job = lookup_origin_job(self.cfg.cache_dir, cache_key)
-            jd = self._job_dir(job_id)
+
+            if not (origin_job and self._is_ready_job(origin_job)):
+                # Same content may already be synthesizing in another job: wait for it instead
+                origin_job = self._await_inflight(cache_key, job_id)
+                if origin_job is None:
+                    inflight_key = cache_key
+                    heartbeat = self._start_heartbeat(cache_key, job_id)
             
-            if origin_job and self._is_ready_job(origin_job):
+            if origin_job:
                 logger.info(f"Cache hit for job {job_id}, using origin job {origin_job}")
-                origin_audio = self._job_dir(origin_job) / "tts_out.wav"
-                origin_timings = self._job_dir(origin_job) / "timings.json"
+                od = self._artifact_dir(origin_job)
+                origin_audio = od / "tts_out.wav"
+                origin_timings = od / "timings.json"
 
                 if not origin_audio.exists() or not origin_timings.exists():
                     msg = f"Cache inconsistency: READY job {origin_job} missing artifacts"
                     logger.error(msg)
                     raise RuntimeError(msg)
 
-                self._link_or_copy(origin_audio, jd / "tts_out.wav")
-                self._link_or_copy(origin_timings, jd / "timings.json")
+                if self.cfg.cache_materialize:
+                    self._link_or_copy(origin_audio, jd / "tts_out.wav")
+                    self._link_or_copy(origin_timings, jd / "timings.json")
+                    origin_packed = od / "timings.msgpack"
+                    if origin_packed.exists():
+                        self._link_or_copy(origin_packed, jd / "timings.msgpack")
+                else:
+                    # Artifact getters follow this pointer; od is always a materialized job
+                    (jd / _ORIGIN_FILE).write_text(od.name, encoding="utf-8")
 
                 manifest = Manifest(
                     audioUrl=f"/v1/tts/jobs/{job_id}/audio",
@@ -162,8 +346,7 @@ class JobManager:
                 )
                 self._write_json(jd / "manifest.json", manifest.model_dump(mode="json"))
 
-                self._transition(job_id, JobState.ALIGNING)
-                self._transition(job_id, JobState.READY)
+                self._transition_many(job_id, [JobState.ALIGNING, JobState.READY])
                 return
             
             # --- Cache Miss ---
@@ -176,17 +359,18 @@ class JobManager:
                 audio_path = synthesize_chunked(
                     script=effective_script,
                     registry=registry,
-                    output_dir=self._job_dir(job_id),
+                    output_dir=jd,
                     output_basename="tts_out",
                     google_api_key=self.cfg.google_api_key,
                     tts_model=self.cfg.tts_model,
                     request_timeout_sec=self.cfg.request_timeout_sec,
+                    requests_per_batch=self.cfg.requests_per_batch,
                 )
             else:
                 audio_path = synthesize_single_pass(
                     script=effective_script,
                     registry=registry,
-                    output_dir=self._job_dir(job_id),
+                    output_dir=jd,
                     output_basename="tts_out",  
                     google_api_key=self.cfg.google_api_key,
                     tts_model=self.cfg.tts_model,
@@ -204,8 +388,12 @@ class JobManager:
                 model_name=self.cfg.whisper_model,
                 device=self.cfg.whisper_device,
                 compute_type=self.cfg.whisper_compute_type,
+                cuda_compute_type=self.cfg.whisper_compute_type_cuda,
+                cache_dir=self.cfg.cache_dir,
             )
-            self._write_json(self._job_dir(job_id) / "timings.json", timings)
+            # Compact: served byte-for-byte by the timings endpoint
+            self._write_json(jd / "timings.json", timings, pretty=False)
+            self._write_atomic(jd / "timings.msgpack", msgpack.packb(timings, use_bin_type=True))
             logger.info(f"Alignment complete for job {job_id}")
             
             # Manifest
@@ -214,11 +402,11 @@ class JobManager:
                 timingsUrl=f"/v1/tts/jobs/{job_id}/timings",
                 script=ui_script,
             )
-            self._write_json(self._job_dir(job_id) / "manifest.json", manifest.model_dump(mode="json"))
+            self._write_json(jd / "manifest.json", manifest.model_dump(mode="json"))
             
             if logger.isEnabledFor(logging.DEBUG):
-                (self._job_dir(job_id) / "ui_script.txt").write_text(ui_script, encoding="utf-8")
-                (self._job_dir(job_id) / "alignment_script.txt").write_text(alignment_script, encoding="utf-8")
+                (jd / "ui_script.txt").write_text(ui_script, encoding="utf-8")
+                (jd / "alignment_script.txt").write_text(alignment_script, encoding="utf-8")
 
             self._transition(job_id, JobState.READY)
             logger.info(f"Job {job_id} is READY")
@@ -228,32 +416,121 @@ class JobManager:
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}", exc_info=True)
             self._transition(job_id, JobState.FAILED, error=str(e))
-            
+        finally:
+            if heartbeat is not None:
+                heartbeat.set()
+            if inflight_key:
+                release_inflight(self.cfg.cache_dir, inflight_key, job_id)
+
+    def _get_dialect_pool(self) -> ProcessPoolExecutor:
+        with self._dialect_pool_lock:
+            if self._dialect_pool is None:
+                self._dialect_pool = ProcessPoolExecutor(
+                    max_workers=self.cfg.dialect_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._dialect_pool
+
+    def _resolve_registry(self, roles: List[str]) -> SpeakerRegistry:
+        search_paths = [
+            self._app_root / "config" / "voices.yml",
+            self._app_root / "config" / "voices.yaml",
+        ]
+        return resolve_registry(roles, search_paths=search_paths)  # parse is cached by file mtime
+
+    def _await_inflight(self, key: str, job_id: str) -> Optional[str]:
+        """
+        Claim key for this job, or wait on the job already synthesizing the same content.
+        Returns that job's id once it is READY, or None when this job should synthesize.
+        """
+        deadline = time.monotonic() + self.cfg.request_timeout_sec
+        while True:
+            owner = claim_inflight(self.cfg.cache_dir, key, job_id)
+            if owner is None or owner == job_id:
+                # A previous owner may have finished (and released) just before this claim
+                origin = lookup_origin_job(self.cfg.cache_dir, key)
+                if origin and self._is_ready_job(origin):
+                    release_inflight(self.cfg.cache_dir, key, job_id)
+                    return origin
+                return None
+            if time.monotonic() >= deadline:
+                return None  # stop waiting; synthesize without the claim
+            logger.info(f"Job {job_id} waiting on in-flight job {owner} with identical content")
+            if self._wait_terminal(owner, key, deadline) == JobState.READY:
+                return owner
+            # Owner failed, vanished, went stale or timed out: drop its claim and try to take over
+            release_inflight(self.cfg.cache_dir, key, owner)
+
+    def _wait_terminal(self, job_id: str, key: str, deadline: float) -> Optional[JobState]:
+        """Poll job_id until it is terminal; None if it vanishes or its claim on key stops beating."""
+        while time.monotonic() < deadline:
+            state = self._job_state(job_id)
+            if state is None:
+                return None
+            if is_terminal(state):
+                return state
+            age = inflight_age(self.cfg.cache_dir, key)
+            if age is None:
+                # Released between the two reads: the owner may have just turned READY
+                return self._job_state(job_id)
+            if age > INFLIGHT_STALE_SEC:
+                return None  # the owner died mid-synthesis
+            time.sleep(_INFLIGHT_POLL_SEC)
+        return None
+
+    def _start_heartbeat(self, key: str, job_id: str) -> threading.Event:
+        """Keep the claim on key fresh until the returned event is set."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(_INFLIGHT_HEARTBEAT_SEC):
+                try:
+                    touch_inflight(self.cfg.cache_dir, key, job_id)
+                except OSError as e:
+                    logger.warning(f"Could not refresh in-flight claim for job {job_id}: {e}")
+
+        threading.Thread(target=beat, name=f"inflight-{job_id}", daemon=True).start()
+        return stop
+
     def _is_ready_job(self, job_id: str) -> bool:
-        st = self._read_json(self._job_dir(job_id) / "status.json")
         try:
-            return st and st.get("state") == JobState.READY.value
+            return self._job_state(job_id) == JobState.READY
         except Exception:
             return False
+
+    def _job_state(self, job_id: str) -> Optional[JobState]:
+        state = self._terminal_states.get(job_id)
+        if state is not None:
+            return state
+        st = self._read_json(self._job_dir(job_id) / "status.json")
+        if not st:
+            return None
+        state = JobState(st["state"])
+        if is_terminal(state):
+            self._terminal_states.put(job_id, state)
+        return state
         
     @staticmethod
     def _link_or_copy(src: Path, dst: Path) -> None:
         dst.parent.mkdir(parents=True, exist_ok=True)
         if dst.exists():
             return
+        if _reflink(src, dst):  # copy-on-write clone (no extra space, independent inode)
+            return
         try:
             os.link(src, dst)  # hard link (no extra space)
         except Exception:
             try:
                 os.symlink(src, dst)  # fallback to symlink
             except Exception:
-                shutil.copy2(src, dst)  # last resort: copy
+                _sendfile_copy(src, dst)  # last resort: in-kernel copy
 
     def get_status(self, job_id: str) -> Optional[JobStatus]:
         st = self._read_json(self._job_dir(job_id) / "status.json")
         if not st:
             return None
-        return JobStatus(
+        # Trusted: written by _transition; skip re-validation on the polling path
+        return JobStatus.model_construct(
             id=st["id"],
             state=JobState(st["state"]),
             error=st.get("error"),
@@ -268,11 +545,21 @@ class JobManager:
         return Manifest(**d)
 
     def get_audio_path(self, job_id: str) -> Path:
-        p = self._job_dir(job_id) / "tts_out.wav"
+        p = self._artifact_dir(job_id) / "tts_out.wav"
         return p
 
     def get_timings_path(self, job_id: str) -> Path:
-        return self._job_dir(job_id) / "timings.json"
+        return self._artifact_dir(job_id) / "timings.json"
+
+    def get_timings_msgpack_path(self, job_id: str) -> Path:
+        return self._artifact_dir(job_id) / "timings.msgpack"
+
+    def read_timings_msgpack(self, job_id: str) -> bytes:
+        """Packed timings; packs from timings.json for jobs created before timings.msgpack existed."""
+        p = self.get_timings_msgpack_path(job_id)
+        if p.exists():
+            return p.read_bytes()
+        return msgpack.packb(self.read_timings(job_id), use_bin_type=True)
 
     def read_timings(self, job_id: str) -> Dict[str, Any]:
         d = self._read_json(self.get_timings_path(job_id))
@@ -288,39 +575,87 @@ class JobManager:
     def _job_dir(self, job_id: str) -> Path:
         return self.cfg.jobs_dir / job_id
 
+    def _artifact_dir(self, job_id: str) -> Path:
+        """Directory holding the job's audio/timings: its own, or the origin job's on a cache hit."""
+        jd = self._job_dir(job_id)
+        try:
+            origin_job = (jd / _ORIGIN_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return jd
+        return self._job_dir(origin_job)
+
+    def fail_job(self, job_id: str, error: str) -> None:
+        """Mark a job FAILED from outside run_job (e.g. its worker process died)."""
+        self._transition(job_id, JobState.FAILED, error=error)
+
     def _read_request(self, job_id: str) -> Dict[str, Any]:
         return self._read_json(self._job_dir(job_id) / "request.json") or {}
 
     def _transition(self, job_id: str, dst_state: JobState, error: Optional[str] = None) -> None:
+        self._transition_many(job_id, [dst_state], error=error)
+
+    def _transition_many(self, job_id: str, dst_states: List[JobState], error: Optional[str] = None) -> None:
+        """Walk through dst_states in order, validating each edge, with a single status write."""
         st_path = self._job_dir(job_id) / "status.json"
         st = self._read_json(st_path)
         if not st:
             raise RuntimeError("job status missing")
 
         src_state = JobState(st["state"])
-        if not can_transition(src_state, dst_state):
-            # Still update error + updatedAt, but keep remaining state
-            if error:
-                st["error"] = error
-                st["updatedAt"] = time.time()
-                self._write_json(st_path, st)
-            raise RuntimeError(f"Invalid state transition: {src_state.value} -> {dst_state.value}")
-
-        st["state"] = dst_state.value
+        for dst_state in dst_states:
+            if not can_transition(src_state, dst_state):
+                # Still update error + updatedAt, but keep remaining state
+                if error:
+                    st["error"] = error
+                    st["updatedAt"] = time.time()
+                    self._write_json(st_path, st)
+                raise RuntimeError(f"Invalid state transition: {src_state.value} -> {dst_state.value}")
+            src_state = dst_state
+
+        st["state"] = src_state.value
         if error:
             st["error"] = error
         st["updatedAt"] = time.time()
         self._write_json(st_path, st)
+        if is_terminal(src_state):
+            self._terminal_states.put(job_id, src_state)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any], pretty: bool = True) -> None:
+        if orjson is not None:
+            opts = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            payload = orjson.dumps(data, option=opts)
+        elif pretty:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        else:
+            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        JobManager._write_atomic(path, payload)
 
     @staticmethod
-    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        """Write via a sibling temp file + os.replace so readers never see a partial file."""
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        set_default_mode(fd)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
 
     @staticmethod
     def _read_json(path: Path) -> Optional[Dict[str, Any]]:
         if not path.exists():
             return None
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    """Process-wide JobManager built from current Settings."""
+    return JobManager.from_settings(get_settings())
@@ -0,0 +1,99 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.config.config import get_settings
+from app.services.align.aligner import get_whisper_model
+from app.services.jobs.manager import get_job_manager
+from app.utils.logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker() -> None:
+    s = get_settings()
+    configure_logging(s.debug)
+    if s.whisper_preload:
+        try:
+            get_whisper_model(s.whisper_model, s.whisper_device, s.whisper_compute_type, s.whisper_compute_type_cuda)
+        except Exception as e:
+            # An initializer error breaks the whole pool; the first job loads the model instead
+            logger.error(f"Whisper preload failed, loading on first use: {e}", exc_info=True)
+
+
+def _run_job(job_id: str) -> None:
+    get_job_manager().run_job(job_id)
+
+
+def _fail_job(job_id: str, error: str) -> None:
+    try:
+        get_job_manager().fail_job(job_id, error)
+    except Exception as e:  # already terminal, or status unreadable
+        logger.error(f"Could not mark job {job_id} failed: {e}")
+
+
+def _log_crash(job_id: str, fut: Future) -> None:
+    # run_job records its own failures; this catches a dead worker process, or errors
+    # raised outside run_job's try block (building the manager, writing the FAILED status).
+    if fut.cancelled():
+        return
+    exc = fut.exception()
+    if exc is None:
+        return
+    if isinstance(exc, BrokenProcessPool):
+        logger.error(f"Worker process died while running job {job_id}: {exc}")
+        _fail_job(job_id, f"Worker process died: {exc}")
+    else:
+        logger.error(f"Job {job_id} raised outside run_job: {exc!r}")
+        _fail_job(job_id, str(exc))
+
+
+def _get_pool(broken: Optional[ProcessPoolExecutor] = None) -> ProcessPoolExecutor:
+    """Return the shared pool, replacing it first if it is the `broken` one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is broken:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=get_settings().job_workers,
+                # spawn: forking a threaded server process can deadlock the child
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _pool
+
+
+def submit_job(job_id: str) -> None:
+    """
+    Queue a job for execution on the worker pool and return immediately.
+    Synthesis and alignment run in separate processes, off the API event loop.
+    A pool broken by a dead worker is rebuilt once; if that fails too the job is marked FAILED.
+    """
+    pool = _get_pool()
+    try:
+        fut = pool.submit(_run_job, job_id)
+    except BrokenProcessPool:
+        logger.warning("Job worker pool is broken; starting a new one")
+        try:
+            fut = _get_pool(broken=pool).submit(_run_job, job_id)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.error(f"Could not submit job {job_id}: {e}")
+            _fail_job(job_id, f"Could not start job worker: {e}")
+            return
+    fut.add_done_callback(lambda f: _log_crash(job_id, f))
+
+
+def shutdown_workers() -> None:
+    """Stop the worker pool, letting in-flight jobs finish."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=False)
+            _pool = None
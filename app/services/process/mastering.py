@@ -5,7 +5,7 @@ from typing import List, Tuple, Optional
 
 # ---------- Data types ----------
 
-@dataclass
+@dataclass(slots=True)
 class ScriptLine:
     role: str                     # Voice-engine role
     character: Optional[str]      # Character label
@@ -13,7 +13,7 @@ class ScriptLine:
     simple_cues: List[str]        # lower-case () cues
     control_cues: List[str]       # UPPER_SNAKE_CASE () cues
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDoc:
     styles_raw: str               # after "STYLE DESCRIPTION:"
     vocals_raw: str               # after "VOCAL DICTIONARY:"
@@ -40,6 +40,9 @@ _ROLE_LINE = re.compile(
 # inline cues: (...)
 _PAREN_GROUP = re.compile(r"\(([^)]*)\)")
 
+# UPPER_SNAKE_CASE control cue
+_CTRL_RE = re.compile(r"[A-Z0-9_]+")
+
 def parse_text(text: str) -> ParsedDoc:
     """
         Parse the doc with headings:
@@ -130,7 +133,7 @@ def _classify_cues(utter: str) -> Tuple[List[str], List[str]]:
         inner = (m.group(1) or "").strip()
         if not inner:
             continue
-        if re.fullmatch(r"[A-Z0-9_]+", inner):
+        if _CTRL_RE.fullmatch(inner):
             control.append(inner)
         else:
             simple.append(inner)
@@ -142,11 +145,11 @@ def _classify_cues(utter: str) -> Tuple[List[str], List[str]]:
 # remove all (...) cues
 _PAREN_STRIP = re.compile(r"\([^)]*\)")
 
-# remove leading [Role]
-_ROLE_TAG = re.compile(r"^\s*\[[^\]]+\]\s*")
+# remove leading [Role] and/or <Character> in one match
+_LEAD_TAGS = re.compile(r"^\s*(?:\[[^\]]+\]\s*)?(?:<[^>]+>\s*[:\-]?\s*)?")
 
-# Remove leading <Character> 
-_CHAR_TAG = re.compile(r"^\s*<[^>]+>\s*[:\-]?\s*")
+# collapse whitespace runs
+_WS_RE = re.compile(r"\s+")
 
 
 def build_ui_script(doc: ParsedDoc) -> str:
@@ -157,12 +160,11 @@ def build_ui_script(doc: ParsedDoc) -> str:
       - Prefer <Character> for display; if missing, fall back to <role>.
       - Preserve inline cues (...) so users can see expressive guidance.
     """
-    out_lines: List[str] = []
-    for line in doc.lines:
-        if not line.text.strip():
-            continue
-        display_name = line.character or line.role
-        out_lines.append(f"<{display_name}> {line.text.strip()}")
+    out_lines = [
+        f"<{line.character or line.role}> {text}"
+        for line in doc.lines
+        if (text := line.text.strip())
+    ]
     return "\n".join(out_lines).strip()
 
 
@@ -176,10 +178,9 @@ def build_alignment_text_from_ui(ui_script: str) -> str:
     """
     lines: List[str] = []
     for raw in ui_script.splitlines():
-        txt = _ROLE_TAG.sub("", raw)
-        txt = _CHAR_TAG.sub("", txt)
+        txt = _LEAD_TAGS.sub("", raw, count=1)
         txt = _PAREN_STRIP.sub("", txt)
-        txt = re.sub(r"\s+", " ", txt).strip()
+        txt = _WS_RE.sub(" ", txt).strip()
         if txt:
             lines.append(txt)
     return "\n".join(lines).strip()
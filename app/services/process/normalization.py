@@ -1,5 +1,15 @@
 import re
-from typing import Dict, List
+import string
+from concurrent.futures import Executor
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # regex alternation fallback
+    ahocorasick = None
+
+from app.services.process.mastering import ParsedDoc
 
 
 DE_DIALECT_MAP: Dict[str, str] = {
@@ -68,10 +78,10 @@ DE_DIALECT_MAP: Dict[str, str] = {
 }
 
 
-_PAREN_GROUP = re.compile(r"\([^)]*\)")
+# split keeps the (...) groups at odd indices
+_PAREN_SPLIT = re.compile(r"(\([^)]*\))")
 _SMART_APOS_RE = re.compile(r"[’‘]")
 _LEADING_ALPHA_RE = re.compile(r"^([^A-Za-z]*)([a-z])")
-_LINE_RE = re.compile(r"^\s*<([^>]+)>\s*(.*)$")
 _SENTENCE_START_RE = re.compile(
     r"((?:(?<!\.)[.!?]|\.{3}|…)\s*(?:[\"'”’\)\]]*)\s+)([\"'“‘\(\[]*)([a-z])"
 )
@@ -81,25 +91,71 @@ def _ascii_apostrophes(s: str) -> str:
 
 
 def _stage_a_pattern(keys: List[str]) -> re.Pattern[str]:
+    # longest first so alternation picks e.g. 'ardly before 'ard
     ordered = sorted(keys, key=len, reverse=True)
     inner = "|".join(map(re.escape, ordered))
-    pattern = r"(^|(?<![A-Za-z]))(?:" + inner + r")(?![A-Za-z])"
-    return re.compile(pattern, flags=re.IGNORECASE)
+    return re.compile(r"(?i)(?<![A-Za-z])(?:" + inner + r")(?![A-Za-z])")
+
+
+# matches are lowercased once and looked up directly
+_DE_MAP_LOWER: Dict[str, str] = {k.lower(): v for k, v in DE_DIALECT_MAP.items()}
+_STAGE_A_RE = _stage_a_pattern(list(_DE_MAP_LOWER))
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+
+def _stage_a_automaton():
+    if ahocorasick is None:
+        return None
+    A = ahocorasick.Automaton()
+    for k, v in _DE_MAP_LOWER.items():
+        A.add_word(k, (len(k), v))
+    A.make_automaton()
+    return A
 
 
-_STAGE_A_RE = _stage_a_pattern(list(DE_DIALECT_MAP.keys()))
+_STAGE_A_AC = _stage_a_automaton()
 _H_INSERT_RE = re.compile(r"(^|(?<![A-Za-z]))'(?=[aeiou])", flags=re.IGNORECASE)
 _G_DROP_FIX_RE = re.compile(r"(\b\w+?)in'(?![A-Za-z])")  
 
 
+def _stage_a_repl(m: re.Match[str]) -> str:
+    w = m.group(0)
+    return _DE_MAP_LOWER.get(w.lower(), w)
+
+
 def _stage_a(seg: str) -> str:
-    def repl(m: re.Match[str]) -> str:
-        left = m.group(1) or ""
-        token = seg[m.start(0) + len(left):m.end(0)]
-        val = DE_DIALECT_MAP.get(token.lower())
-        return left + (val if val is not None else token)
+    low = seg.lower()
+    if _STAGE_A_AC is None or len(low) != len(seg):
+        # lowercasing changed offsets (e.g. 'İ'): indices would not line up
+        return _STAGE_A_RE.sub(_stage_a_repl, seg)
+
+    # One Aho-Corasick pass; keep the longest boundary-respecting match per start,
+    # then take them leftmost-first like the regex alternation does.
+    n = len(seg)
+    best: Dict[int, Tuple[int, str]] = {}
+    for end, (klen, value) in _STAGE_A_AC.iter(low):
+        start = end - klen + 1
+        if start and seg[start - 1] in _ASCII_LETTERS:
+            continue
+        if end + 1 < n and seg[end + 1] in _ASCII_LETTERS:
+            continue
+        cur = best.get(start)
+        if cur is None or end > cur[0]:
+            best[start] = (end, value)
+    if not best:
+        return seg
 
-    return _STAGE_A_RE.sub(repl, seg)
+    out: List[str] = []
+    pos = 0
+    for start in sorted(best):
+        if start < pos:
+            continue
+        end, value = best[start]
+        out.append(seg[pos:start])
+        out.append(value)
+        pos = end + 1
+    out.append(seg[pos:])
+    return "".join(out)
 
 
 def _stage_b(seg: str) -> str:
@@ -109,21 +165,11 @@ def _stage_b(seg: str) -> str:
 
 
 def _normalize(text: str) -> str:
-    text = _ascii_apostrophes(text)
-    out_parts: List[str] = []
-    pos = 0
-    for m in _PAREN_GROUP.finditer(text):
-        pre = text[pos:m.start()]
-        if pre:
-            pre = _stage_b(_stage_a(pre))
-        out_parts.append(pre)
-        out_parts.append(m.group(0))  
-        pos = m.end()
-    tail = text[pos:]
-    if tail:
-        tail = _stage_b(_stage_a(tail))
-    out_parts.append(tail)
-    return "".join(out_parts)
+    parts = _PAREN_SPLIT.split(_ascii_apostrophes(text))
+    for i in range(0, len(parts), 2):
+        if parts[i]:
+            parts[i] = _stage_b(_stage_a(parts[i]))
+    return "".join(parts)
 
 
 def _capitalize(text: str) -> str:
@@ -134,37 +180,34 @@ def _capitalize(text: str) -> str:
             seg = prefix + ch.upper() + seg[m.end():]
         return _SENTENCE_START_RE.sub(lambda mm: mm.group(1) + mm.group(2) + mm.group(3).upper(), seg)
 
-    out_parts: List[str] = []
-    pos = 0
-    for pm in _PAREN_GROUP.finditer(text):
-        pre = text[pos:pm.start()]
-        if pre:
-            pre = cap_leading(pre)
-        out_parts.append(pre)
-        out_parts.append(pm.group(0))
-        pos = pm.end()
-    tail = text[pos:]
-    if tail:
-        tail = cap_leading(tail)
-    out_parts.append(tail)
-    return "".join(out_parts)
-
-
-def apply_de_dialect(ui_script: str) -> str:
+    parts = _PAREN_SPLIT.split(text)
+    for i in range(0, len(parts), 2):
+        if parts[i]:
+            parts[i] = cap_leading(parts[i])
+    return "".join(parts)
+
+
+# Below this many narrator chars, pickling + IPC costs more than the regex passes themselves
+PARALLEL_MIN_CHARS = 4096
+
+
+def _normalize_then_capitalize(text: str) -> str:
+    return _capitalize(_normalize(text.strip()))
+
+
+def apply_de_dialect_to_doc(doc: ParsedDoc, executor: Optional[Executor] = None) -> ParsedDoc:
     """
-    Transform only lines with <Narrator>.
+    Transform only lines displayed as <Narrator> (character, else role).
+    With an executor, narrator lines of large scripts are normalized on it in parallel.
     """
-    out_lines: List[str] = []
-    for raw in ui_script.splitlines():
-        m = _LINE_RE.match(raw)
-        if not m:
-            out_lines.append(raw)
-            continue
-        label, text = m.group(1), m.group(2)
-        if (label or "").strip() == "Narrator":
-            norm = _normalize(text)
-            norm = _capitalize(norm)
-            out_lines.append(f"<{label}> {norm}".rstrip())
-        else:
-            out_lines.append(raw)
-    return "\n".join(out_lines)
+    idx = [i for i, line in enumerate(doc.lines) if (line.character or line.role) == "Narrator"]
+    texts = [doc.lines[i].text for i in idx]
+    if executor is not None and sum(map(len, texts)) > PARALLEL_MIN_CHARS:
+        out = executor.map(_normalize_then_capitalize, texts, chunksize=max(1, len(texts) // 64))
+    else:
+        out = map(_normalize_then_capitalize, texts)
+
+    lines = list(doc.lines)
+    for i, text in zip(idx, out):
+        lines[i] = replace(lines[i], text=text)
+    return replace(doc, lines=lines)
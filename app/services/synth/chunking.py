@@ -1,21 +1,25 @@
-import base64
-import concurrent.futures
-import io
+import asyncio
+import heapq
 import logging
+import os
 import re
+import struct
+import tempfile
 import time
-import wave
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
-from google import genai
 from google.genai import types
 
 from app.services.process.mastering import (
 	parse_text,
 	ScriptLine,
 )
+from app.utils.aio import run_coroutine
+from app.utils.audio import extract_inline_audio, is_wav
+from app.utils.clients import get_client, get_speech_config, voice_key
+from app.utils.files import set_default_mode
 
 logger = logging.getLogger(__name__)
 
@@ -25,40 +29,102 @@ LINES_PER_CHUNK = 30
 @dataclass
 class ChunkResult:
 	index: int
-	wav_bytes: bytes
-
-
-def _read_wav_params(wav_bytes: bytes) -> Tuple[int, int, int]:
-	with wave.open(io.BytesIO(wav_bytes), "rb") as wf:
-		return wf.getnchannels(), wf.getsampwidth(), wf.getframerate()
-
-
-def _concat_wavs(wavs: List[bytes], silence_ms: int = 150) -> bytes:
-	if not wavs:
-		return b""
-	ch, sw, fr = _read_wav_params(wavs[0])
-	silence_frames = int(fr * silence_ms / 1000)
-	silence_bytes = (b"\x00" * sw * ch) * silence_frames
-	out = io.BytesIO()
-	with wave.open(out, "wb") as wf_out:
-		wf_out.setnchannels(ch)
-		wf_out.setsampwidth(sw)
-		wf_out.setframerate(fr)
-		for i, b in enumerate(wavs):
-			with wave.open(io.BytesIO(b), "rb") as wf_in:
-				if (wf_in.getnchannels(), wf_in.getsampwidth(), wf_in.getframerate()) != (ch, sw, fr):
-					raise ValueError("Inconsistent WAV formats across chunks")
-				frames = wf_in.readframes(wf_in.getnframes())
-				wf_out.writeframes(frames)
-			if i < len(wavs) - 1:
-				wf_out.writeframes(silence_bytes)
-	return out.getvalue()
+	pcm: memoryview  # raw sample data, no container
+	sr: int
+	ch: int
+	sw: int
+
+
+# RIFF/WAVE header for PCM, as written by the wave module: RIFF, fmt (16 bytes), data
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+
+def _wav_header(ch: int, sw: int, fr: int, data_size: int) -> bytes:
+	return _WAV_HEADER.pack(
+		b"RIFF", 36 + data_size, b"WAVE",
+		b"fmt ", 16, 1, ch, fr, fr * ch * sw, ch * sw, sw * 8,
+		b"data", data_size,
+	)
+
+
+def _wav_pcm(wav_bytes: bytes) -> Tuple[Tuple[int, int, int], memoryview]:
+	"""Return ((channels, sampwidth, framerate), PCM payload) by walking the RIFF chunks; no copy."""
+	mv = memoryview(wav_bytes)
+	if not is_wav(mv):
+		raise ValueError("Not a RIFF/WAVE payload")
+	params: Optional[Tuple[int, int, int]] = None
+	pos = 12
+	while pos + 8 <= len(mv):
+		cid, size = struct.unpack_from("<4sI", mv, pos)
+		body = pos + 8
+		if cid == b"fmt ":
+			tag, ch, fr, _, _, bits = struct.unpack_from("<HHIIHH", mv, body)
+			if tag not in (1, 0xFFFE):  # PCM / WAVE_FORMAT_EXTENSIBLE
+				raise ValueError(f"Unsupported WAV format tag: {tag}")
+			params = (ch, (bits + 7) // 8, fr)
+		elif cid == b"data":
+			if params is None:
+				raise ValueError("WAV data chunk precedes fmt chunk")
+			frame = params[0] * params[1]
+			n = min(size, len(mv) - body)
+			return params, mv[body:body + n - n % frame]  # whole frames only, like wave.readframes
+		pos = body + size + (size & 1)
+	raise ValueError("WAV has no data chunk")
+
+
+class _WavMerger:
+	"""
+	Appends chunk PCM in index order to `out` (a fresh seekable binary file) while results arrive
+	in any order. Out-of-order chunks wait on a min-heap; each is released as soon as it is written.
+	"""
+
+	def __init__(self, out: BinaryIO, silence_ms: int = 150):
+		self._silence_ms = silence_ms
+		self._heap: List[Tuple[int, ChunkResult]] = []
+		self._next = 0
+		self._params: Optional[Tuple[int, int, int]] = None
+		self._silence = b""
+		self._out = out
+		self._out.seek(_WAV_HEADER.size)  # header goes in last, once the size is known
+
+	def add(self, result: ChunkResult) -> None:
+		heapq.heappush(self._heap, (result.index, result))  # indices are unique: never compares results
+		while self._heap and self._heap[0][0] == self._next:
+			_, r = heapq.heappop(self._heap)
+			self._append(r)
+			self._next += 1
+
+	def _append(self, r: ChunkResult) -> None:
+		params = (r.ch, r.sw, r.sr)
+		if self._params is None:
+			self._params = params
+			ch, sw, fr = params
+			silence_frames = int(fr * self._silence_ms / 1000)
+			self._silence = bytes(sw * ch * silence_frames)  # one zeroed buffer, reused for every gap
+		elif params != self._params:
+			raise ValueError("Inconsistent WAV formats across chunks")
+		else:
+			self._out.write(self._silence)
+		self._out.write(r.pcm)
+
+	def finish(self) -> None:
+		"""Check every chunk arrived, then fill in the header now that the size is known."""
+		if self._heap:
+			raise RuntimeError(f"Missing chunk {self._next} before merge could finish")
+		if self._params is None:
+			self._out.truncate(0)
+			return
+		data_size = self._out.tell() - _WAV_HEADER.size
+		self._out.seek(0)
+		self._out.write(_wav_header(*self._params, data_size))
+
+
+_HEADER_RE = re.compile(r"(?m)^(?:\s*STYLE DESCRIPTION:|\s*VOCAL DICTIONARY:|\s*SCRIPT:)\s*$")
 
 
 def _find_first_header_index(text: str) -> Optional[int]:
 	"""Return the byte index of the first known header or None if not found."""
-	pat = re.compile(r"(?m)^(?:\s*STYLE DESCRIPTION:|\s*VOCAL DICTIONARY:|\s*SCRIPT:)\s*$")
-	m = pat.search(text)
+	m = _HEADER_RE.search(text)
 	return m.start() if m else None
 
 
@@ -78,21 +144,16 @@ def _split_sections_and_parse(script: str):
 def _format_line_for_tts(line: ScriptLine) -> str:
 	"""Reconstruct a script line in the canonical input format for TTS."""
 	role = line.role.strip()
-	prefix = f"[{role}] "
 	char = (line.character or "").strip()
+	text = line.text.strip()
 	if char:
-		prefix += f"<{char}> "
-	return f"{prefix}{line.text.strip()}".strip()
+		return f"[{role}] <{char}> {text}".rstrip()
+	return f"[{role}] {text}".rstrip()
 
 
 def _group_lines_into_chunks(lines: List[ScriptLine], lines_per_chunk: int) -> List[List[str]]:
 	"""Group formatted lines into fixed-size chunks by line count."""
-	formatted: List[str] = []
-	for line in lines:
-		s = _format_line_for_tts(line)
-		if s:
-			formatted.append(s)
-
+	formatted = [s for s in map(_format_line_for_tts, lines) if s]
 	if not formatted:
 		return []
 
@@ -109,47 +170,35 @@ def _group_lines_into_chunks(lines: List[ScriptLine], lines_per_chunk: int) -> L
 	return chunks
 
 
-def _build_chunk_payload(
-		instructions: str,
-		styles: str,
-		vocals: str,
-		script_lines: List[str],
-) -> str:
+def _batch_chunks(chunks: List[List[str]], requests_per_batch: int) -> List[List[str]]:
+	"""Fold every `requests_per_batch` consecutive chunks into one request."""
+	if requests_per_batch <= 1:
+		return chunks
+	return [
+		[line for chunk in chunks[i:i + requests_per_batch] for line in chunk]
+		for i in range(0, len(chunks), requests_per_batch)
+	]
+
+
+def _build_payload_prefix(instructions: str, styles: str, vocals: str) -> str:
+	"""Shared head of every chunk payload, ending with the SCRIPT: label."""
 	parts: List[str] = []
 	if instructions:
 		parts.append(instructions.strip())
-	if styles.strip():
+	styles = styles.strip()
+	if styles:
 		parts.append("STYLE DESCRIPTION:")
-		parts.append(styles.strip())
-	if vocals.strip():
+		parts.append(styles)
+	vocals = vocals.strip()
+	if vocals:
 		parts.append("VOCAL DICTIONARY:")
-		parts.append(vocals.strip())
-  
+		parts.append(vocals)
 	parts.append("SCRIPT:")
-	parts.append("\n".join(script_lines).strip())
-	return "\n\n".join(parts).strip()
-
-
-def _extract_inline_audio(resp) -> Tuple[Optional[bytes], Optional[str]]:
-	for cand in getattr(resp, "candidates", []) or []:
-		content = getattr(cand, "content", None)
-		parts = getattr(content, "parts", []) if content else []
-		for p in parts:
-			inline = getattr(p, "inline_data", None) or getattr(p, "inlineData", None)
-			if not inline:
-				continue
-			mime: Optional[str] = getattr(inline, "mime_type", None) or getattr(inline, "mimeType", None)
-			data = getattr(inline, "data", None)
-			if data is None:
-				continue
-			if isinstance(data, (bytes, bytearray)):
-				return bytes(data), mime
-			if isinstance(data, str):
-				try:
-					return base64.b64decode(data), mime
-				except Exception:
-					return None, mime
-	return None, None
+	return "\n\n".join(parts).lstrip()
+
+
+def _build_chunk_payload(prefix: str, script_lines: List[str]) -> str:
+	return prefix + "\n\n" + "\n".join(script_lines)  # lines are already stripped
 
 
 def synthesize_chunked(
@@ -162,12 +211,14 @@ def synthesize_chunked(
 	request_timeout_sec: int = 900,
 	max_workers: int = 5,
 	silence_ms: int = 150,
+	requests_per_batch: int = 1,
 ) -> Path:
 	"""Chunk the script, synthesize in parallel and then merge.
 
 	- Replicates STYLE DESCRIPTION and VOCAL DICTIONARY per chunk.
 	- Concatenates WAVs losslessly; wraps PCM as needed.
 	- Inserts a short silence between chunks (default 150 ms) to improve naturalness.
+	- requests_per_batch > 1 sends that many consecutive chunks as one request.
 	"""
 
 	if not google_api_key:
@@ -176,91 +227,77 @@ def synthesize_chunked(
 	# 1) Extract sections
 	instructions, styles, vocals, lines = _split_sections_and_parse(script)
 	line_chunks = _group_lines_into_chunks(lines, lines_per_chunk=LINES_PER_CHUNK)
+	line_chunks = _batch_chunks(line_chunks, requests_per_batch)
 	if not line_chunks:
 		raise ValueError("Empty script after parsing")
 
 	# 3) Prepare client, multi-speaker config, and payloads
-	client = genai.Client(api_key=google_api_key)
+	client = get_client(google_api_key)
 
 	roles: List[str] = list(registry.keys())
 	if len(roles) < 1:
 		raise ValueError("registry must contain at least one role.")
 
-	speaker_cfgs: List[types.SpeakerVoiceConfig] = []
-	for role in roles:
-		vc = registry[role]
-		voice_name = vc["name"] if isinstance(vc, dict) else getattr(vc, "name", None)
-		if not voice_name:
-			raise ValueError(f"voice name missing for role '{role}'")
-		speaker_cfgs.append(
-			types.SpeakerVoiceConfig(
-				speaker=role,
-				voice_config=types.VoiceConfig(
-					prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
+	speech_config = get_speech_config(voice_key(registry))
+
+	prefix = _build_payload_prefix(instructions, styles or "", vocals or "")
+	payloads = [_build_chunk_payload(prefix, chunk_lines) for chunk_lines in line_chunks]
+
+	# 4) Concurrent synth: one coroutine per chunk, at most max_workers requests in flight
+	async def _one_pass(sem: asyncio.Semaphore, i: int, payload: str) -> ChunkResult:
+		async with sem:
+			t0 = time.time()
+			resp = await client.aio.models.generate_content(
+				model=tts_model,
+				contents=[payload],
+				config=types.GenerateContentConfig(
+					response_modalities=["AUDIO"],
+					speech_config=speech_config,
 				),
 			)
-		)
-
-	speech_config = types.SpeechConfig(
-		multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
-			speaker_voice_configs=speaker_cfgs
-		)
-	)
+		# base64 decode + RIFF walk run off the loop so it keeps servicing other chunks' I/O
+		return await asyncio.to_thread(_postprocess, i, resp, t0)
 
-	payloads: List[str] = []
-	for chunk_lines in line_chunks:
-		payloads.append(
-			_build_chunk_payload(
-				instructions=instructions,
-				styles=styles or "",
-				vocals=vocals or "",
-				script_lines=chunk_lines,
-			)
-		)
-
-	# 4) Parallel synth
-	results: List[ChunkResult] = []
-
-	def _one_pass(i: int, payload: str) -> ChunkResult:
-		t0 = time.time()
-		resp = client.models.generate_content(
-			model=tts_model,
-			contents=[payload],
-			config=types.GenerateContentConfig(
-				response_modalities=["AUDIO"],
-				speech_config=speech_config,
-			),
-		)
-		audio_bytes, mime = _extract_inline_audio(resp)
+	def _postprocess(i: int, resp, t0: float) -> ChunkResult:
+		audio_bytes, _ = extract_inline_audio(resp)
 		if not audio_bytes:
 			raise RuntimeError(f"No audio returned for chunk {i}")
 
-		m = (mime or "").lower()
-		if "wav" in m:
-			wav_bytes = audio_bytes
+		# Keep only the samples; the merger writes the single output header
+		if is_wav(audio_bytes):
+			(ch, sw, sr), pcm = _wav_pcm(audio_bytes)
 		else:
-			tmp = io.BytesIO()
-			with wave.open(tmp, "wb") as wf:
-				wf.setnchannels(1)
-				wf.setsampwidth(2)
-				wf.setframerate(24000)
-				wf.writeframes(audio_bytes)
-			wav_bytes = tmp.getvalue()
+			ch, sw, sr = 1, 2, 24000  # raw s16le @ 24 kHz mono
+			pcm = memoryview(audio_bytes)
+			pcm = pcm[:len(pcm) - len(pcm) % (ch * sw)]
 		dt = time.time() - t0
 		if logger.isEnabledFor(logging.INFO):
-			logger.info(f"Chunk {i} synthesized in {dt:.2f}s, bytes={len(wav_bytes)}")
-		return ChunkResult(index=i, wav_bytes=wav_bytes)
-
-	with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-		futs = [ex.submit(_one_pass, i, p) for i, p in enumerate(payloads)]
-		for fut in concurrent.futures.as_completed(futs):
-			results.append(fut.result())
-
-	# 5) Merge 
-	results.sort(key=lambda r: r.index)
-	merged = _concat_wavs([r.wav_bytes for r in results], silence_ms=silence_ms)
+			logger.info(f"Chunk {i} synthesized in {dt:.2f}s, bytes={len(pcm)}")
+		return ChunkResult(index=i, pcm=pcm, sr=sr, ch=ch, sw=sw)
+
+	# 5) Merge each chunk into the output file as soon as every earlier one has arrived
+	async def _run_all(merger: _WavMerger) -> None:
+		sem = asyncio.Semaphore(max_workers)
+		tasks = [asyncio.ensure_future(_one_pass(sem, i, p)) for i, p in enumerate(payloads)]
+		try:
+			for fut in asyncio.as_completed(tasks):
+				merger.add(await fut)
+		finally:
+			for t in tasks:
+				t.cancel()  # no-op once done; stops the rest if one chunk failed
 
 	output_dir.mkdir(parents=True, exist_ok=True)
 	out_path = output_dir / f"{output_basename}.wav"
-	out_path.write_bytes(merged)
+	# Stream into a temp file beside the target so a failed run never leaves a partial WAV
+	fd, tmp = tempfile.mkstemp(dir=output_dir, prefix=out_path.name, suffix=".tmp")
+	set_default_mode(fd)
+	try:
+		with os.fdopen(fd, "wb") as f:
+			merger = _WavMerger(f, silence_ms)
+			run_coroutine(_run_all(merger))
+			merger.finish()
+		os.replace(tmp, out_path)
+	except BaseException:
+		Path(tmp).unlink(missing_ok=True)
+		raise
 	return out_path
@@ -0,0 +1,33 @@
+import base64
+from typing import Optional, Tuple, Union
+
+
+def is_wav(b: bytes) -> bool:
+    """Sniff the RIFF/WAVE magic; the reported mime type varies across SDK versions."""
+    return len(b) >= 12 and b[:4] == b"RIFF" and b[8:12] == b"WAVE"
+
+
+def extract_inline_audio(resp) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    First inline audio payload in a generate_content response, as (bytes, mime type).
+    - Some SDK builds return bytes; some return base64 string.
+    - google.genai parts are pydantic models, so fields are read by their snake_case names.
+    """
+    for cand in getattr(resp, "candidates", None) or []:
+        content = getattr(cand, "content", None)
+        for p in getattr(content, "parts", None) or []:
+            inline = getattr(p, "inline_data", None)
+            if not inline:
+                continue
+            data: Union[bytes, bytearray, str, None] = getattr(inline, "data", None)
+            if data is None:
+                continue
+            mime: Optional[str] = getattr(inline, "mime_type", None)
+            if isinstance(data, (bytes, bytearray)):
+                return bytes(data), mime
+            if isinstance(data, str):
+                try:
+                    return base64.b64decode(data), mime
+                except Exception:
+                    return None, mime
+    return None, None
@@ -1,21 +1,45 @@
 import json
 import hashlib
-import re
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
 
-_INDEX_FILE = "index.json"
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+from app.utils.files import set_default_mode
+
+
+_INDEX_FILE = "index.jsonl"
+_COMPACT_EVERY = 1000  # appends between log rewrites
+_INDEX_MAX_ENTRIES = 10_000  # in-memory LRU bound; older keys stay on disk
+_KEY_VERSION = b"v2"  # bump when the key derivation changes so old index entries can't collide
+_INFLIGHT_DIR = "inflight"
+INFLIGHT_STALE_SEC = 30.0  # a claim not refreshed for this long belongs to a dead job
 
 
 def _normalize_script(s: str) -> str:
-    # remove ALL whitespace
-    return re.sub(r"\s+", "", s, flags=re.UNICODE)
+    # remove ALL whitespace (str.split() uses the same Unicode whitespace class as \s)
+    return "".join(s.split())
 
 
-def _normalize_registry(registry: Dict[str, Any]) -> Dict[str, str]:
+def _normalize_registry(registry: Dict[str, Any]) -> List[Tuple[str, str]]:
     """
     Works whether values are VoiceConfig objects or dicts.
+    Returns (role, voice name) pairs sorted by role.
     """
     slim = {
         str(role): str(cfg["name"] if isinstance(cfg, dict) else getattr(cfg, "name", ""))
@@ -25,56 +49,296 @@ def _normalize_registry(registry: Dict[str, Any]) -> Dict[str, str]:
     if any(not v for v in slim.values()):
         missing = [r for r, v in slim.items() if not v]
         raise ValueError(f"registry missing for roles: {missing}")
-    return dict(sorted(slim.items()))
+    return sorted(slim.items())
 
 
 def make_cache_key(script: str, registry: Dict[str, Any], model: str) -> str:
-    payload = {
-        "script": _normalize_script(script),
-        "registry": _normalize_registry(registry),
-        "model": model,
-    }
-    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+    # Fed field by field (NUL-separated) instead of hashing one big JSON document.
+    # Not a security boundary, so the faster blake2b over sha256.
+    h = hashlib.blake2b(_KEY_VERSION + b"\0", digest_size=32)
+    h.update(_normalize_script(script).encode("utf-8"))
+    h.update(b"\0")
+    for role, name in _normalize_registry(registry):
+        h.update(role.encode("utf-8"))
+        h.update(b"\0")
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+    h.update(model.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _dumps_line(obj: Dict[str, str]) -> bytes:
+    """One compact JSON record plus newline; the log is machine-read, so no indent."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
 
-def _index_path(cache_root: Path) -> Path:
-    return cache_root / _INDEX_FILE
+_loads = orjson.loads if orjson is not None else json.loads
 
 
-def load_index(cache_root: Path) -> Dict[str, Any]:
-    p = _index_path(cache_root)
-    if not p.exists():
-        return {}
+def _read_gen(first_line: bytes) -> Optional[str]:
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+        return _loads(first_line).get("gen")
+    except (ValueError, AttributeError):
+        return None
+
+
+@contextmanager
+def _file_lock(path: Path, exclusive: bool) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+class _Index:
+    """
+    In-memory view of one cache root's append-only index log (one {"k", "j"} JSON line
+    per recorded origin). Other processes' appends are picked up by reading the tail.
+    Only the most recently used _INDEX_MAX_ENTRIES keys are held in memory; once any
+    were evicted, a miss falls back to scanning the log, which still has them all.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock_path = path.with_suffix(".lock")
+        self.entries: "OrderedDict[str, str]" = OrderedDict()
+        self.lock = threading.RLock()
+        self._ino: Optional[int] = None
+        self._gen: Optional[str] = None
+        self._offset = 0
+        self._appends = 0
+        self._evicted = False
+
+    def get(self, key: str) -> Optional[str]:
+        job_id = self.entries.get(key)
+        if job_id is not None:
+            self.entries.move_to_end(key)
+        return job_id
+
+    def put(self, key: str, job_id: str) -> None:
+        self.entries[key] = job_id
+        self.entries.move_to_end(key)
+        if len(self.entries) > _INDEX_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+            self._evicted = True
+
+    def _reset(self, ino: Optional[int], gen: Optional[str]) -> None:
+        self.entries, self._evicted = OrderedDict(), False
+        self._ino, self._gen, self._offset = ino, gen, 0
+
+    def refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset(None, None)
+            return
+        if st.st_ino == self._ino and st.st_size == self._offset:
+            return
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            gen = _read_gen(f.readline())
+            # Inode numbers get recycled, so a rewrite is recognized by its generation line too
+            if st.st_ino != self._ino or gen != self._gen or st.st_size < self._offset:
+                self._reset(st.st_ino, gen)
+            f.seek(self._offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a writer may be mid-line; leave the partial tail
+        for line in data[:end].splitlines():
+            try:
+                rec = _loads(line)
+                self.put(rec["k"], rec["j"])
+            except (ValueError, KeyError, TypeError):
+                continue  # generation line, or a torn/foreign record
+        self._offset += end
+
+    def _read_all(self) -> Dict[str, str]:
+        """Every live record in the log, last write wins."""
+        out: Dict[str, str] = {}
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partial tail of an in-progress append
+                    try:
+                        rec = _loads(line)
+                        out[rec["k"]] = rec["j"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return out
+
+    def scan(self, key: str) -> Optional[str]:
+        """Look up a key that may have been evicted from memory by reading the whole log."""
+        if not self._evicted:
+            return None
+        needle = key.encode("utf-8")
+        job_id = None
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if needle not in line or not line.endswith(b"\n"):
+                        continue
+                    try:
+                        rec = _loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(rec, dict) and rec.get("k") == key:
+                        job_id = rec.get("j")
+        except FileNotFoundError:
+            return None
+        if job_id is not None:
+            self.put(key, job_id)
+        return job_id
+
+    def append(self, key: str, job_id: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = _dumps_line({"k": key, "j": job_id})
+        # Appenders share the lock; only a rewrite takes it exclusively
+        with _file_lock(self._lock_path, exclusive=False):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)  # single O_APPEND write: concurrent writers don't interleave
+            finally:
+                os.close(fd)
+        self.put(key, job_id)
+        self._appends += 1
+        if self._appends >= _COMPACT_EVERY:
+            self.compact()
+
+    def compact(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self._lock_path, exclusive=True):
+            self.refresh()
+            # With evictions the memory view is partial, so dedupe from the log itself
+            self._write(self._read_all() if self._evicted else self.entries)
+
+    def _write(self, records: Dict[str, str]) -> None:
+        """Rewrite the log as a fresh generation line plus one record per live entry."""
+        gen = uuid.uuid4().hex
+        blob = _dumps_line({"gen": gen}) + b"".join(
+            _dumps_line({"k": k, "j": j}) for k, j in records.items()
+        )
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        set_default_mode(fd)
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, self.path)
+        st = os.stat(self.path)
+        self._ino, self._gen, self._offset, self._appends = st.st_ino, gen, st.st_size, 0
 
 
-def save_index(cache_root: Path, idx: Dict[str, Any]) -> None:
-    p = _index_path(cache_root)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    tmp = p.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(idx, ensure_ascii=False, indent=2), encoding="utf-8")
-    tmp.replace(p)
+_indexes: Dict[Path, _Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(cache_root: Path) -> _Index:
+    with _indexes_lock:
+        idx = _indexes.get(cache_root)
+        if idx is None:
+            idx = _indexes[cache_root] = _Index(cache_root / _INDEX_FILE)
+        return idx
 
 
 def lookup_origin_job(cache_root: Path, key: str) -> Optional[str]:
     """
     Returns job_id if present in index; None otherwise.
     """
-    idx = load_index(cache_root)
-    entry = idx.get(key)
-    if entry and isinstance(entry, dict):
-        return entry.get("job_id")
-    return None
+    idx = _get_index(cache_root)
+    with idx.lock:
+        job_id = idx.get(key)
+        if job_id is None:
+            idx.refresh()  # only misses need to look for other processes' appends
+            job_id = idx.get(key) or idx.scan(key)
+        return job_id
 
 
 def record_origin_job(cache_root: Path, key: str, job_id: str) -> None:
     """
-    Writes/updates index: key -> job_id
+    Appends key -> job_id to the index log
+    """
+    idx = _get_index(cache_root)
+    with idx.lock:
+        idx.append(key, job_id)
+
+
+def claim_inflight(cache_root: Path, key: str, job_id: str) -> Optional[str]:
+    """
+    Atomically mark key as being synthesized by job_id.
+    Returns None if the claim was taken, else the job_id already holding it.
+    """
+    d = cache_root / _INFLIGHT_DIR
+    d.mkdir(parents=True, exist_ok=True)
+    p = d / key
+    tmp = d / f"{key}.{job_id}.tmp"
+    tmp.write_text(job_id, encoding="utf-8")
+    try:
+        while True:
+            try:
+                os.link(tmp, p)  # fails if another job holds the claim
+                return None
+            except FileExistsError:
+                try:
+                    return p.read_text(encoding="utf-8").strip()
+                except FileNotFoundError:
+                    continue  # released in between; retry
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def touch_inflight(cache_root: Path, key: str, job_id: str) -> None:
+    """Refresh the claim's mtime (the owner's heartbeat) if job_id still holds it."""
+    p = cache_root / _INFLIGHT_DIR / key
+    try:
+        if p.read_text(encoding="utf-8").strip() == job_id:
+            os.utime(p)
+    except FileNotFoundError:
+        pass
+
+
+def inflight_age(cache_root: Path, key: str) -> Optional[float]:
+    """Seconds since the claim on key was last refreshed, or None if there is no claim."""
+    try:
+        return time.time() - (cache_root / _INFLIGHT_DIR / key).stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def clear_stale_inflight(cache_root: Path) -> None:
+    """
+    Drop claims (and claim temp files) nobody has refreshed for INFLIGHT_STALE_SEC.
+    Live claims of sibling server processes are left alone.
     """
-    idx = load_index(cache_root)
-    idx[key] = {"job_id": job_id}
-    save_index(cache_root, idx)
+    d = cache_root / _INFLIGHT_DIR
+    if not d.is_dir():
+        return
+    cutoff = time.time() - INFLIGHT_STALE_SEC
+    for p in d.iterdir():
+        try:
+            if p.stat().st_mtime < cutoff:
+                p.unlink(missing_ok=True)
+        except FileNotFoundError:
+            continue
+
+
+def release_inflight(cache_root: Path, key: str, job_id: str) -> None:
+    """
+    Drop the in-flight claim on key if job_id holds it.
+    """
+    p = cache_root / _INFLIGHT_DIR / key
+    try:
+        if p.read_text(encoding="utf-8").strip() == job_id:
+            p.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,45 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+from google import genai
+from google.genai import types
+
+
+VoiceKey = Tuple[Tuple[str, str], ...]
+
+
+@lru_cache(maxsize=4)
+def get_client(api_key: str) -> genai.Client:
+    return genai.Client(api_key=api_key)  # Reuse HTTP pool/TLS across jobs and chunks.
+
+
+def voice_key(registry: Dict[str, Any]) -> VoiceKey:
+    """
+    (role, voice_name) pairs in registry order; hashable input for get_speech_config.
+    Works whether values are VoiceConfig objects or dicts.
+    """
+    pairs = []
+    for role, vc in registry.items():
+        voice_name = vc["name"] if isinstance(vc, dict) else getattr(vc, "name", None)
+        if not voice_name:
+            raise ValueError(f"voice name missing for role '{role}'")
+        pairs.append((role, voice_name))
+    return tuple(pairs)
+
+
+@lru_cache(maxsize=32)
+def get_speech_config(voices: VoiceKey) -> types.SpeechConfig:
+    """MultiSpeakerVoiceConfig for 1..N roles, built once per voice assignment."""
+    return types.SpeechConfig(
+        multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+            speaker_voice_configs=[
+                types.SpeakerVoiceConfig(
+                    speaker=role,
+                    voice_config=types.VoiceConfig(
+                        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
+                    ),
+                )
+                for role, voice_name in voices
+            ]
+        )
+    )
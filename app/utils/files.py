@@ -0,0 +1,12 @@
+import os
+
+# mkstemp creates files 0600 and os.replace keeps that; match what a plain open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+
+def set_default_mode(fd: int) -> None:
+    """Give a mkstemp file the umask-derived mode of a normally created file."""
+    if hasattr(os, "fchmod"):  # not on Windows, where the mode bits don't apply anyway
+        os.fchmod(fd, _FILE_MODE)
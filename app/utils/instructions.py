@@ -1,14 +1,15 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from app.config.config import get_settings
 
 
-def _read(path: Path) -> Optional[str]:
-    if path.exists():
-        txt = path.read_text(encoding="utf-8").strip()
-        return txt or None
-    return None
+@lru_cache(maxsize=8)
+def _read_cached(path_str: str, mtime_ns: int, size: int) -> Optional[str]:
+    # mtime/size are part of the key only, so an edited file is re-read on the next call
+    txt = Path(path_str).read_text(encoding="utf-8").strip()
+    return txt or None
 
 
 def load_tts_instructions() -> Optional[str]:
@@ -17,7 +18,12 @@ def load_tts_instructions() -> Optional[str]:
     if not s.use_instructions:
         return None
 
-    return _read(s.instructions_path)
+    path = s.instructions_path
+    try:
+        st = path.stat()
+        return _read_cached(str(path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
 
 def prepend_tts_instructions(script: str) -> str:
     instr = load_tts_instructions()
@@ -1,16 +1,74 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
 
+_FILE_BUFFER_SIZE = 64 * 1024
+_FILE_FLUSH_INTERVAL_SEC = 30.0
+
+_listener: Optional[QueueListener] = None
+
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler backed by a 64 KiB write buffer.
+    Flushes on WARNING+ records, every ~30s, when the buffer fills, and on close.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._last_flush = time.monotonic()
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=_FILE_BUFFER_SIZE, encoding=self.encoding, errors=self.errors)
+
+    def flush(self) -> None:
+        # StreamHandler.emit flushes after every record; defer to emit() instead.
+        pass
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        now = time.monotonic()
+        if record.levelno >= logging.WARNING or now - self._last_flush >= _FILE_FLUSH_INTERVAL_SEC:
+            super().flush()
+            self._last_flush = now
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue: records are enqueued as-is.
+    The stock prepare() pre-formats them for pickling, folding the traceback into msg,
+    which pushes the "(file:line)" suffix below the traceback.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains queued records
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def configure_logging(debug: bool, logfile: Optional[str] = None) -> None:
     """
     Configure loggers with a clean, consistent format.
     - debug=True  -> level=DEBUG, verbose
     - debug=False -> level=INFO
     - If logfile is provided write to a rotating file.
+    Records are enqueued by the calling thread and written by a background listener,
+    so request threads never block on stdout/file writes.
     """
+    global _listener
     level = logging.DEBUG if debug else logging.INFO
     fmt = (
         "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s "
@@ -24,17 +82,24 @@ def configure_logging(debug: bool, logfile: Optional[str] = None) -> None:
     # Clear existing handlers to avoid duplicate logs on app reload
     for h in list(root.handlers):
         root.removeHandler(h)
+    _stop_listener()
 
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setLevel(level)
     stream_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
-    root.addHandler(stream_handler)
+    handlers = [stream_handler]
 
     if logfile:
-        file_handler = RotatingFileHandler(logfile, maxBytes=10 * 1024 * 1024, backupCount=3)
+        file_handler = _BufferedRotatingFileHandler(logfile, maxBytes=10 * 1024 * 1024, backupCount=3)
         file_handler.setLevel(level)
         file_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
-        root.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _LocalQueueHandler(log_queue)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Forces uvicorn loggers to use the same log level as root.
     for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
@@ -42,9 +107,7 @@ def configure_logging(debug: bool, logfile: Optional[str] = None) -> None:
         lg.setLevel(level)
         for h in list(lg.handlers):
             lg.removeHandler(h)
-        lg.addHandler(stream_handler)
-        if logfile:
-            lg.addHandler(file_handler)
+        lg.addHandler(queue_handler)
 
 
 def get_logger(name: str) -> logging.Logger:
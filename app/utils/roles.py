@@ -1,16 +1,19 @@
 import yaml 
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
 from app.domain.schemas import VoiceConfig, SpeakerRegistry
 
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml when PyYAML was built with it
+
 def _load_full_registry(path: Path) -> SpeakerRegistry:
     if not path.exists():
         raise FileNotFoundError(f"speaker registry not found: {path}")
     if path.suffix.lower() not in (".yml", ".yaml"):
         raise ValueError(f"unsupported registry format: {path.suffix} (use .yml or .yaml)")
 
-    data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
     if not isinstance(data, dict):
         raise ValueError("invalid registry file: expected mapping of role -> config")
 
@@ -23,6 +26,11 @@ def _load_full_registry(path: Path) -> SpeakerRegistry:
         raise ValueError(f"empty registry in file: {path}")
     return reg
 
+@lru_cache(maxsize=4)
+def _load_cached(path_str: str, mtime_ns: int) -> SpeakerRegistry:
+    # mtime_ns only keys the cache: editing the registry file misses and re-parses
+    return _load_full_registry(Path(path_str))
+
 def resolve_registry(required_roles: List[str], *, search_paths: List[Path]) -> SpeakerRegistry:
     """Read the first available YAML registry, then return only the entries for `required_roles`."""
     if not required_roles:
@@ -30,9 +38,12 @@ def resolve_registry(required_roles: List[str], *, search_paths: List[Path]) ->
     
     full: SpeakerRegistry | None = None
     for p in search_paths:
-        if p.exists():
-            full = _load_full_registry(p)
-            break
+        try:
+            mtime_ns = p.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+        full = _load_cached(str(p), mtime_ns)
+        break
     if full is None:
         raise FileNotFoundError("No registry file found. Provide voices.yml or voices.yaml at ./app/config.")
 
@@ -1,3 +1,5 @@
+import os
+
 import uvicorn
 
 from app.config.config import get_settings
@@ -5,11 +7,17 @@ from app.config.config import get_settings
 
 def main() -> None:
     s = get_settings()
+    # Split cores across the job worker processes so each CTranslate2/OpenMP pool gets its
+    # share instead of every process spinning up one thread per core. Env overrides win.
+    job_procs = max(1, s.workers * s.job_workers)
+    os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // job_procs)))
+    os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
     uvicorn.run(
         "app.main:app",
         host=s.host,
         port=s.port,
         reload=s.debug,
+        workers=s.workers,
         ssl_keyfile=s.ssl_keyfile,
         ssl_certfile=s.ssl_certfile,
     )